@@ -7,115 +7,236 @@ Subcommands:
     update-page   Update properties on an existing page
     query-db      Query a database with optional filters
     append-blocks Append content blocks to a page
+    append-blocks-bulk
+                  Append any number of blocks, 100 per request
     get-page      Retrieve a page and its properties
+    batch         Run a JSONL file of operations concurrently
 
 Friendly names from notion-config.json are resolved automatically when passed
 as the --target argument.
 """
 
 import argparse
+import asyncio
+import functools
+import itertools
 import json
 import os
+import re
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from dotenv import load_dotenv
-from notion_client import Client
-
-load_dotenv()
+if TYPE_CHECKING:
+    from notion_client import Client
 
 CONFIG_PATH = Path(__file__).resolve().parent.parent / "notion-config.json"
 TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
 
+# A raw Notion ID once dashes are stripped: 32 hex digits.
+_ID_RE = re.compile(r"[0-9a-f]{32}", re.IGNORECASE)
+
+# Notion rejects append-children requests carrying more blocks than this.
+MAX_CHILDREN_PER_REQUEST = 100
+
+# Notion's documented average rate limit, and how many batch requests may be
+# in flight at once.
+BATCH_MAX_PER_SECOND = 3
+BATCH_MAX_AT_ONCE = 10
+
+_CLIENT = None
+_TOKEN = None
+
+
+def get_token() -> str:
+    """Return NOTION_API_TOKEN, loading .env on first use."""
+    global _TOKEN
+    if _TOKEN is None:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        token = os.environ.get("NOTION_API_TOKEN")
+        if not token:
+            raise SystemExit("Error: NOTION_API_TOKEN is not set. See .env.example.")
+        _TOKEN = token
+    return _TOKEN
 
-def get_client() -> Client:
-    token = os.environ.get("NOTION_API_TOKEN")
-    if not token:
-        print("Error: NOTION_API_TOKEN is not set. See .env.example.", file=sys.stderr)
-        sys.exit(1)
-    return Client(auth=token)
 
+def _http_limits():
+    import httpx
 
-def load_config() -> dict:
+    # Keep-alive pool shared by every request this process makes.
+    return httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60)
+
+
+def get_client() -> "Client":
+    """Return the process-wide Notion client, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        import httpx
+        from notion_client import Client
+
+        token = get_token()
+        _CLIENT = Client(auth=token, client=httpx.Client(limits=_http_limits()))
+    return _CLIENT
+
+
+def _config_mtime_ns() -> int:
     if not CONFIG_PATH.exists():
-        print(f"Error: Config not found at {CONFIG_PATH}", file=sys.stderr)
-        sys.exit(1)
-    with open(CONFIG_PATH) as f:
-        return json.load(f)
+        raise SystemExit(f"Error: Config not found at {CONFIG_PATH}")
+    return CONFIG_PATH.stat().st_mtime_ns
+
+
+@functools.lru_cache(maxsize=1)
+def _target_ids(mtime_ns: int) -> dict:
+    """Friendly name -> Notion ID map, rebuilt only when the config changes."""
+    targets = json.loads(CONFIG_PATH.read_bytes()).get("targets", {})
+    return {name: target["id"] for name, target in targets.items() if "id" in target}
+
+
+def is_raw_id(name: str) -> bool:
+    """True if ``name`` is a raw Notion ID (32 hex chars with optional dashes)."""
+    return _ID_RE.fullmatch(name.replace("-", "")) is not None
 
 
 def resolve_target(name: str) -> str:
     """Resolve a friendly name to a Notion ID. If the name looks like a raw
     Notion ID (32 hex chars with optional dashes), return it directly."""
-    cleaned = name.replace("-", "")
-    if len(cleaned) == 32 and all(c in "0123456789abcdef" for c in cleaned):
+    if is_raw_id(name):
         return name
-    config = load_config()
-    targets = config.get("targets", {})
-    if name not in targets:
-        print(f"Error: Target '{name}' not found in notion-config.json", file=sys.stderr)
-        print(f"Available targets: {', '.join(targets.keys())}", file=sys.stderr)
-        sys.exit(1)
-    return targets[name]["id"]
+    ids = _target_ids(_config_mtime_ns())
+    if name not in ids:
+        raise SystemExit(
+            f"Error: Target '{name}' not found in notion-config.json\n"
+            f"Available targets: {', '.join(ids.keys())}"
+        )
+    return ids[name]
+
+
+@functools.lru_cache(maxsize=None)
+def _template_cached(path_str: str, mtime_ns: int) -> bytes:
+    """Template JSON with the top-level "object" key dropped."""
+    template = json.loads(Path(path_str).read_bytes())
+    template.pop("object", None)
+    return json.dumps(template).encode()
 
 
 def load_template(name: str) -> dict:
     path = TEMPLATES_DIR / f"{name}.json"
     if not path.exists():
-        print(f"Error: Template '{name}' not found at {path}", file=sys.stderr)
-        sys.exit(1)
-    with open(path) as f:
-        return json.load(f)
-
-
-# -- Subcommands --------------------------------------------------------------
-
-
-def cmd_create_page(args):
-    client = get_client()
-    parent_id = resolve_target(args.target)
-
-    if args.template:
-        body = load_template(args.template)
+        raise SystemExit(f"Error: Template '{name}' not found at {path}")
+    return json.loads(_template_cached(str(path), path.stat().st_mtime_ns))
+
+
+@functools.lru_cache(maxsize=256)
+def parse_json_arg(value: str):
+    """Parse a JSON argument. The result is shared between calls; don't mutate it."""
+    return json.loads(value)
+
+
+def chunked(items, size: int):
+    """Yield successive lists of at most ``size`` items from any iterable."""
+    it = iter(items)
+    while chunk := list(itertools.islice(it, size)):
+        yield chunk
+
+
+def iter_blocks(args):
+    """Yield the blocks given by --blocks, or stream them from --blocks-file."""
+    not_array = "Error: blocks must be a JSON array of block objects"
+    if args.blocks is not None:
+        try:
+            blocks = parse_json_arg(args.blocks)
+        except json.JSONDecodeError as exc:
+            raise SystemExit(f"Error: --blocks is not valid JSON ({exc})")
+        if not isinstance(blocks, list):
+            raise SystemExit(not_array)
+        yield from blocks
+        return
+    path = Path(args.blocks_file)
+    if not path.exists():
+        raise SystemExit(f"Error: Blocks file not found at {path}")
+    import ijson
+
+    with open(path, "rb") as f:
+        try:
+            events = ijson.parse(f, use_float=True)
+            first = next(events)
+            if first[1] != "start_array":
+                raise SystemExit(not_array)
+            yield from ijson.items(itertools.chain([first], events), "item")
+        except ijson.JSONError as exc:
+            # yajl-backed errors append a multi-line excerpt; keep the summary.
+            reason = str(exc).splitlines()[0] if str(exc) else type(exc).__name__
+            raise SystemExit(f"Error: {path} is not valid JSON ({reason})")
+
+
+def print_json(obj) -> None:
+    """Write ``obj`` to stdout as indented JSON."""
+    import orjson
+
+    data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE, default=str)
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        # stdout has been swapped for a text-only stream (e.g. io.StringIO).
+        sys.stdout.write(data.decode())
+        return
+    sys.stdout.flush()
+    buffer.write(data)
+    sys.stdout.flush()
+
+
+def page_body(parent_id: str, template: str | None = None, title: str | None = None) -> dict:
+    if template:
+        body = load_template(template)
     else:
         body = {
             "properties": {
-                "title": {"title": [{"type": "text", "text": {"content": args.title or "Untitled"}}]}
+                "title": {"title": [{"type": "text", "text": {"content": title or "Untitled"}}]}
             },
             "children": [],
         }
 
     body["parent"] = {"page_id": parent_id}
+    return body
 
-    result = client.pages.create(**body)
-    print(json.dumps(result, indent=2, default=str))
-
-
-def cmd_create_db(args):
-    client = get_client()
-    parent_id = resolve_target(args.target)
 
-    if args.template:
-        body = load_template(args.template)
+def database_body(parent_id: str, template: str | None = None, title: str | None = None) -> dict:
+    if template:
+        body = load_template(template)
     else:
         body = {
-            "title": [{"type": "text", "text": {"content": args.title or "Untitled Database"}}],
+            "title": [{"type": "text", "text": {"content": title or "Untitled Database"}}],
             "properties": {"Name": {"title": {}}},
         }
 
     body["parent"] = {"page_id": parent_id}
-    body.pop("object", None)
+    return body
+
 
-    result = client.databases.create(**body)
-    print(json.dumps(result, indent=2, default=str))
+# -- Subcommands --------------------------------------------------------------
+
+
+def cmd_create_page(args):
+    client = get_client()
+    parent_id = resolve_target(args.target)
+    result = client.pages.create(**page_body(parent_id, args.template, args.title))
+    print_json(result)
+
+
+def cmd_create_db(args):
+    client = get_client()
+    parent_id = resolve_target(args.target)
+    result = client.databases.create(**database_body(parent_id, args.template, args.title))
+    print_json(result)
 
 
 def cmd_update_page(args):
     client = get_client()
     page_id = resolve_target(args.target)
-    properties = json.loads(args.properties)
+    properties = parse_json_arg(args.properties)
     result = client.pages.update(page_id=page_id, properties=properties)
-    print(json.dumps(result, indent=2, default=str))
+    print_json(result)
 
 
 def cmd_query_db(args):
@@ -123,26 +244,249 @@ def cmd_query_db(args):
     db_id = resolve_target(args.target)
     kwargs = {"database_id": db_id}
     if args.filter:
-        kwargs["filter"] = json.loads(args.filter)
+        kwargs["filter"] = parse_json_arg(args.filter)
     if args.sorts:
-        kwargs["sorts"] = json.loads(args.sorts)
+        kwargs["sorts"] = parse_json_arg(args.sorts)
     result = client.databases.query(**kwargs)
-    print(json.dumps(result, indent=2, default=str))
+    print_json(result)
 
 
 def cmd_append_blocks(args):
     client = get_client()
     page_id = resolve_target(args.target)
-    children = json.loads(args.blocks)
+    children = list(iter_blocks(args))
     result = client.blocks.children.append(block_id=page_id, children=children)
-    print(json.dumps(result, indent=2, default=str))
+    print_json(result)
+
+
+def cmd_append_blocks_bulk(args):
+    import httpx
+    from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+    client = get_client()
+    page_id = resolve_target(args.target)
+
+    # Chunks go out one after another: appends to the same parent land in
+    # arrival order, so sending them concurrently would shuffle the content.
+    results = []
+    chunks = chunked(iter_blocks(args), MAX_CHILDREN_PER_REQUEST)
+    while True:
+        offset = len(results) * MAX_CHILDREN_PER_REQUEST
+        try:
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            results.append(client.blocks.children.append(block_id=page_id, children=chunk))
+        except (SystemExit, HTTPResponseError, RequestTimeoutError, httpx.HTTPError) as exc:
+            # SystemExit comes from iter_blocks hitting bad input mid-stream.
+            reason = exc.code if isinstance(exc, SystemExit) else f"Error: {exc}"
+            print_json(results)
+            raise SystemExit(
+                f"{reason}\nStopped at block {offset}: {len(results)} chunk(s) before it "
+                "were appended; their results are on stdout."
+            )
+    print_json(results)
 
 
 def cmd_get_page(args):
     client = get_client()
     page_id = resolve_target(args.target)
     page = client.pages.retrieve(page_id=page_id)
-    print(json.dumps(page, indent=2, default=str))
+    print_json(page)
+
+
+# -- Batch --------------------------------------------------------------------
+
+# Batch op name -> attribute path of the SDK method that performs it.
+BATCH_ENDPOINTS = {
+    "create-page": ("pages", "create"),
+    "create-db": ("databases", "create"),
+    "update-page": ("pages", "update"),
+    "query-db": ("databases", "query"),
+    "append-blocks": ("blocks", "children", "append"),
+    "get-page": ("pages", "retrieve"),
+}
+
+
+def _batch_kwargs(op: dict, target_id: str) -> dict:
+    """SDK keyword arguments for one batch operation. Raises KeyError when a
+    required field is missing."""
+    kind = op["op"]
+    if kind == "create-page":
+        return page_body(target_id, op.get("template"), op.get("title"))
+    if kind == "create-db":
+        return database_body(target_id, op.get("template"), op.get("title"))
+    if kind == "update-page":
+        return {"page_id": target_id, "properties": op["properties"]}
+    if kind == "query-db":
+        kwargs = {"database_id": target_id}
+        for key in ("filter", "sorts"):
+            if op.get(key):
+                kwargs[key] = op[key]
+        return kwargs
+    if kind == "append-blocks":
+        return {"block_id": target_id, "children": op["blocks"]}
+    return {"page_id": target_id}
+
+
+def load_batch(path: Path, client) -> list[dict]:
+    """Read a JSONL file of operations into the list of requests to send.
+
+    Each line is an object with an ``op`` (a key of BATCH_ENDPOINTS), a
+    ``target``, and the operation's fields as JSON values. Every line is
+    checked before anything is sent. Successive append-blocks lines for one
+    target are merged into 100-block requests."""
+    if not path.exists():
+        raise SystemExit(f"Error: Ops file not found at {path}")
+    requests = []
+    last_for_target = {}
+    with open(path) as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                op = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise SystemExit(f"Error: {path}:{lineno}: invalid JSON ({exc})")
+            if (
+                not isinstance(op, dict)
+                or not isinstance(op.get("op"), str)
+                or op["op"] not in BATCH_ENDPOINTS
+                or not isinstance(op.get("target"), str)
+            ):
+                raise SystemExit(
+                    f"Error: {path}:{lineno}: expected an 'op' ({', '.join(BATCH_ENDPOINTS)}) "
+                    "and a 'target' string"
+                )
+            if op["op"] == "append-blocks" and not (
+                isinstance(op.get("blocks"), list) and op["blocks"]
+            ):
+                raise SystemExit(f"Error: {path}:{lineno}: 'blocks' must be a non-empty JSON array")
+            template = op.get("template")
+            if op["op"] in ("create-page", "create-db") and template is not None and not (
+                isinstance(template, str) and (TEMPLATES_DIR / f"{template}.json").exists()
+            ):
+                raise SystemExit(f"Error: {path}:{lineno}: template '{template}' not found in templates/")
+            try:
+                endpoint = functools.reduce(getattr, BATCH_ENDPOINTS[op["op"]], client)
+            except AttributeError:
+                raise SystemExit(
+                    f"Error: {path}:{lineno}: '{op['op']}' is not supported by the installed "
+                    "notion-client"
+                )
+            if not is_raw_id(op["target"]) and op["target"] not in _target_ids(_config_mtime_ns()):
+                raise SystemExit(
+                    f"Error: {path}:{lineno}: target '{op['target']}' not found in notion-config.json"
+                )
+            target_id = resolve_target(op["target"])
+            try:
+                kwargs = _batch_kwargs(op, target_id)
+            except KeyError as exc:
+                raise SystemExit(f"Error: {path}:{lineno}: '{op['op']}' requires {exc}")
+            # One ID can be spelled with or without dashes, in either case.
+            lane = target_id.replace("-", "").lower()
+
+            if op["op"] != "append-blocks":
+                request = {
+                    "lines": [lineno],
+                    "lane": lane,
+                    "op": op["op"],
+                    "endpoint": endpoint,
+                    "kwargs": kwargs,
+                }
+                requests.append(request)
+                last_for_target[lane] = request
+                continue
+
+            blocks = kwargs["children"]
+            last = last_for_target.get(lane)
+            if last is not None and last["op"] == "append-blocks":
+                room = MAX_CHILDREN_PER_REQUEST - len(last["kwargs"]["children"])
+                if room > 0:
+                    last["kwargs"]["children"].extend(blocks[:room])
+                    last["lines"].append(lineno)
+                    blocks = blocks[room:]
+            for chunk in chunked(blocks, MAX_CHILDREN_PER_REQUEST):
+                request = {
+                    "lines": [lineno],
+                    "lane": lane,
+                    "op": "append-blocks",
+                    "endpoint": endpoint,
+                    "kwargs": {"block_id": target_id, "children": chunk},
+                }
+                requests.append(request)
+                last_for_target[lane] = request
+    return requests
+
+
+class RateLimiter:
+    """Spaces request starts at least ``1 / per_second`` seconds apart."""
+
+    def __init__(self, per_second: float):
+        self._interval = 1 / per_second
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def send_batch(requests: list[dict]) -> list[dict]:
+    """Send ``requests`` and return one outcome per request, in order.
+
+    Requests for the same target run in file order; different targets run
+    concurrently, within BATCH_MAX_AT_ONCE and BATCH_MAX_PER_SECOND."""
+    import httpx
+    from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+    outcomes = [None] * len(requests)
+    by_target = {}
+    for index, request in enumerate(requests):
+        by_target.setdefault(request["lane"], []).append(index)
+
+    semaphore = asyncio.Semaphore(BATCH_MAX_AT_ONCE)
+    limiter = RateLimiter(BATCH_MAX_PER_SECOND)
+
+    async def run_target(indexes):
+        for index in indexes:
+            request = requests[index]
+            outcome = {"lines": request["lines"], "op": request["op"]}
+            async with semaphore:
+                await limiter.wait()
+                try:
+                    outcome["result"] = await request["endpoint"](**request["kwargs"])
+                except (HTTPResponseError, RequestTimeoutError, httpx.HTTPError) as exc:
+                    outcome["error"] = str(exc)
+                except Exception as exc:
+                    outcome["error"] = f"{type(exc).__name__}: {exc}"
+            outcomes[index] = outcome
+
+    await asyncio.gather(*(run_target(indexes) for indexes in by_target.values()))
+    return outcomes
+
+
+async def run_batch(path: Path) -> list[dict]:
+    """Load the operations in ``path`` and send them."""
+    import httpx
+    from notion_client import AsyncClient
+
+    # AsyncClient's own context manager swaps in a bare httpx client, so the
+    # pooled transport is managed here and handed over as-is.
+    async with httpx.AsyncClient(limits=_http_limits()) as http:
+        client = AsyncClient(auth=get_token(), client=http)
+        return await send_batch(load_batch(path, client))
+
+
+def cmd_batch(args):
+    outcomes = asyncio.run(run_batch(Path(args.ops)))
+    print_json(outcomes)
+    if any("error" in outcome for outcome in outcomes):
+        sys.exit(1)
 
 
 # -- CLI -----------------------------------------------------------------------
@@ -182,14 +526,31 @@ def main():
     # append-blocks
     p = sub.add_parser("append-blocks", help="Append content blocks to a page")
     p.add_argument("--target", required=True, help="Friendly name or Notion page ID")
-    p.add_argument("--blocks", required=True, help="JSON array of block objects")
+    blocks = p.add_mutually_exclusive_group(required=True)
+    blocks.add_argument("--blocks", help="JSON array of block objects")
+    blocks.add_argument("--blocks-file", help="Path to a JSON file holding the block array")
     p.set_defaults(func=cmd_append_blocks)
 
+    # append-blocks-bulk
+    p = sub.add_parser(
+        "append-blocks-bulk", help="Append any number of blocks, split into 100-block requests"
+    )
+    p.add_argument("--target", required=True, help="Friendly name or Notion page ID")
+    blocks = p.add_mutually_exclusive_group(required=True)
+    blocks.add_argument("--blocks", help="JSON array of block objects (any length)")
+    blocks.add_argument("--blocks-file", help="Path to a JSON file holding the block array (streamed)")
+    p.set_defaults(func=cmd_append_blocks_bulk)
+
     # get-page
     p = sub.add_parser("get-page", help="Retrieve a page and its properties")
     p.add_argument("--target", required=True, help="Friendly name or Notion page ID")
     p.set_defaults(func=cmd_get_page)
 
+    # batch
+    p = sub.add_parser("batch", help="Run a JSONL file of operations concurrently")
+    p.add_argument("--ops", required=True, help="Path to a JSONL file, one operation per line")
+    p.set_defaults(func=cmd_batch)
+
     args = parser.parse_args()
     args.func(args)
 